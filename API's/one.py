@@ -1,33 +1,74 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+import orjson
+
+
+class OrJSONProvider(JSONProvider):
+    """Serve JSON through orjson instead of the stdlib encoder"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrJSONProvider(app)
+
+# In-memory "database" keyed by employee ID
+employees = {}
+next_id = 1
+version = 0
+# Serialized GET /employees body and the version it was built from
+employees_cache = (None, -1)
 
-# In-memory "database"
-employees = []
+# Helper functions for ETag-based conditional GETs; `version` changes on every write
+def not_modified():
+    etag = str(version)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+def with_etag(response):
+    response.set_etag(str(version), weak=True)
+    return response
 
 # GET all employees
 @app.route('/employees', methods=['GET'])
 def get_employees():
-    return jsonify(employees), 200
+    global employees_cache
+    cached = not_modified()
+    if cached is not None:
+        return cached
+    body, body_version = employees_cache
+    if body_version != version:
+        body = orjson.dumps(list(employees.values()))
+        employees_cache = (body, version)
+    return with_etag(app.response_class(body, mimetype='application/json')), 200
 
 # GET employee by ID
 @app.route('/employees/<int:emp_id>', methods=['GET'])
 def get_employee(emp_id):
-    employee = next((emp for emp in employees if emp["id"] == emp_id), None)
-    if employee:
-        return jsonify(employee), 200
-    return jsonify({"error": "Employee not found"}), 404
+    employee = employees.get(emp_id)
+    if not employee:
+        return jsonify({"error": "Employee not found"}), 404
+    cached = not_modified()
+    if cached is not None:
+        return cached
+    return with_etag(jsonify(employee)), 200
 
 # POST - Add a new employee
 @app.route('/employees', methods=['POST'])
 def add_employee():
+    global next_id, version
     data = request.get_json()
     required_fields = ["name", "place", "email", "designation", "description"]
     if not all(field in data for field in required_fields):
         return jsonify({"error": f"Missing fields. Required: {required_fields}"}), 400
 
     new_employee = {
-        "id": len(employees) + 1,
+        "id": next_id,
         "name": data["name"],
         "place": data["place"],
         "email": data["email"],
@@ -36,27 +77,32 @@ def add_employee():
         "department": data.get("department", "General"),   # optional
         "phone": data.get("phone", "N/A")                  # optional
     }
-    employees.append(new_employee)
+    employees[next_id] = new_employee
+    next_id += 1
+    version += 1
     return jsonify(new_employee), 201
 
 # PUT - Update employee details
 @app.route('/employees/<int:emp_id>', methods=['PUT'])
 def update_employee(emp_id):
+    global version
     data = request.get_json()
-    employee = next((emp for emp in employees if emp["id"] == emp_id), None)
+    employee = employees.get(emp_id)
     if not employee:
         return jsonify({"error": "Employee not found"}), 404
 
     for key, value in data.items():
         if key in employee:
             employee[key] = value
+    version += 1
     return jsonify(employee), 200
 
 # DELETE employee
 @app.route('/employees/<int:emp_id>', methods=['DELETE'])
 def delete_employee(emp_id):
-    global employees
-    employees = [emp for emp in employees if emp["id"] != emp_id]
+    global version
+    if employees.pop(emp_id, None) is not None:
+        version += 1
     return jsonify({"message": f"Employee {emp_id} deleted"}), 200
 
 if __name__ == '__main__':
@@ -1,65 +1,114 @@
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
+import orjson
+import msgspec
+import time
 from datetime import datetime
+from typing import Annotated, Union
+
+
+class Timestamp:
+    """Write time kept as epoch nanoseconds, formatted only when serialized"""
+    __slots__ = ('ns',)
+
+    def __init__(self, ns):
+        self.ns = ns
+
+    def isoformat(self):
+        return datetime.fromtimestamp(self.ns / 1e9).isoformat()
+
+
+def json_default(obj):
+    if isinstance(obj, Timestamp):
+        return obj.isoformat()
+    raise TypeError
+
+
+class OrJSONProvider(JSONProvider):
+    """Serve JSON through orjson instead of the stdlib encoder"""
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=json_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+app.json = OrJSONProvider(app)
 
 # In-memory storage for products
 products = {}
 next_id = 1
+version = 0
+# Serialized GET /products body and the version it was built from
+products_cache = (None, -1)
 
-# Helper function to validate product data
-def validate_product(data):
-    errors = []
-    
-    if 'name' not in data or not data['name']:
-        errors.append('Name is required')
-    
-    if 'description' not in data or not data['description']:
-        errors.append('Description is required')
-    
-    if 'stock' not in data:
-        errors.append('Stock is required')
-    elif not isinstance(data['stock'], int) or data['stock'] < 0:
-        errors.append('Stock must be a non-negative integer')
-    
-    if 'price' not in data:
-        errors.append('Price is required')
-    elif not isinstance(data['price'], (int, float)) or data['price'] < 0:
-        errors.append('Price must be a non-negative number')
-    
-    return errors
+# Helper functions for ETag-based conditional GETs; `version` changes on every write
+def not_modified():
+    etag = str(version)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+        response.set_etag(etag, weak=True)
+        return response
+    return None
+
+def with_etag(response):
+    response.set_etag(str(version), weak=True)
+    return response
+
+# Product schema - msgspec validates it while decoding the request body.
+# Integer prices stay integers in responses; unlike the old isinstance checks,
+# booleans are rejected for stock and price
+class Product(msgspec.Struct):
+    name: Annotated[str, msgspec.Meta(min_length=1)]
+    description: Annotated[str, msgspec.Meta(min_length=1)]
+    stock: Annotated[int, msgspec.Meta(ge=0)]
+    price: Union[Annotated[int, msgspec.Meta(ge=0)], Annotated[float, msgspec.Meta(ge=0)]]
+
+# Helper function to decode and validate product data in one pass
+def decode_product():
+    try:
+        return msgspec.json.decode(request.get_data(), type=Product), []
+    except msgspec.DecodeError as e:
+        return None, [str(e)]
 
 # CREATE - Add a new product
 @app.route('/products', methods=['POST'])
 def create_product():
-    global next_id
-    
-    data = request.get_json()
+    global next_id, version
     
-    # Validate data
-    errors = validate_product(data)
+    # Decode and validate data
+    data, errors = decode_product()
     if errors:
         return jsonify({'error': 'Validation failed', 'details': errors}), 400
     
     # Create product
     product = {
         'id': next_id,
-        'name': data['name'],
-        'description': data['description'],
-        'stock': data['stock'],
-        'price': data['price'],
-        'created_at': datetime.now().isoformat()
+        'name': data.name,
+        'description': data.description,
+        'stock': data.stock,
+        'price': data.price,
+        'created_at': Timestamp(time.time_ns())
     }
     
     products[next_id] = product
     next_id += 1
+    version += 1
     
     return jsonify(product), 201
 
 # READ - Get all products
 @app.route('/products', methods=['GET'])
 def get_products():
-    return jsonify(list(products.values())), 200
+    global products_cache
+    cached = not_modified()
+    if cached is not None:
+        return cached
+    body, body_version = products_cache
+    if body_version != version:
+        body = orjson.dumps(list(products.values()), default=json_default)
+        products_cache = (body, version)
+    return with_etag(app.response_class(body, mimetype='application/json')), 200
 
 # READ - Get a single product by ID
 @app.route('/products/<int:product_id>', methods=['GET'])
@@ -69,41 +118,49 @@ def get_product(product_id):
     if not product:
         return jsonify({'error': 'Product not found'}), 404
     
-    return jsonify(product), 200
+    cached = not_modified()
+    if cached is not None:
+        return cached
+    
+    return with_etag(jsonify(product)), 200
 
 # UPDATE - Update a product by ID
 @app.route('/products/<int:product_id>', methods=['PUT'])
 def update_product(product_id):
+    global version
+    
     product = products.get(product_id)
     
     if not product:
         return jsonify({'error': 'Product not found'}), 404
     
-    data = request.get_json()
-    
-    # Validate data
-    errors = validate_product(data)
+    # Decode and validate data
+    data, errors = decode_product()
     if errors:
         return jsonify({'error': 'Validation failed', 'details': errors}), 400
     
     # Update product
-    product['name'] = data['name']
-    product['description'] = data['description']
-    product['stock'] = data['stock']
-    product['price'] = data['price']
-    product['updated_at'] = datetime.now().isoformat()
+    product['name'] = data.name
+    product['description'] = data.description
+    product['stock'] = data.stock
+    product['price'] = data.price
+    product['updated_at'] = Timestamp(time.time_ns())
+    version += 1
     
     return jsonify(product), 200
 
 # DELETE - Delete a product by ID
 @app.route('/products/<int:product_id>', methods=['DELETE'])
 def delete_product(product_id):
+    global version
+    
     product = products.get(product_id)
     
     if not product:
         return jsonify({'error': 'Product not found'}), 404
     
     del products[product_id]
+    version += 1
     
     return jsonify({'message': 'Product deleted successfully'}), 200
 
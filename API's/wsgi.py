@@ -0,0 +1,17 @@
+"""WSGI entry point for serving the APIs with gunicorn and gevent workers.
+
+Run from the repository root, one server per API:
+
+    gunicorn -k gevent -w 1 --worker-connections 1000 --chdir "API's" wsgi:one
+    gunicorn -k gevent -w 1 --worker-connections 1000 --chdir "API's" -b :5001 wsgi:two
+
+Both APIs keep their data in process memory, so stick to a single worker
+process; the gevent worker provides the concurrency within it.
+"""
+from gevent import monkey
+
+# Patch blocking stdlib modules before Flask is imported
+monkey.patch_all()
+
+from one import app as one
+from two import app as two
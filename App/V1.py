@@ -1,21 +1,70 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.pdfbase.pdfmetrics import stringWidth
 import io
+import time
+from functools import lru_cache
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj) -> str:
+    """Serialize to indented JSON, using orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
+
+
+def loads_json(text: str):
+    """Parse JSON text, using orjson when available"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def format_timestamp(ts: float) -> str:
+    """Format an epoch timestamp recorded by log_result for display"""
+    return datetime.fromtimestamp(ts).isoformat(sep=' ', timespec='seconds')
+
 
 class APITester:
     def __init__(self, base_url: str):
         """Initialize the API Tester with base URL"""
         self.base_url = base_url.rstrip('/')
         self.results = []
+        self._lock = threading.Lock()
+        
+        # Reuse keep-alive connections across all test requests
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+    
+    def close(self):
+        """Close the underlying HTTP session"""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
         
     def log_result(self, test_name: str, status: str, details: str):
         """Log test results"""
@@ -23,9 +72,10 @@ class APITester:
             'test': test_name,
             'status': status,
             'details': details,
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            'timestamp': time.time()
         }
-        self.results.append(result)
+        with self._lock:
+            self.results.append(result)
     
     def test_get(self, endpoint: str = '', expected_status: int = 200, headers: Dict = None):
         """Test GET operation (READ)"""
@@ -33,7 +83,7 @@ class APITester:
         test_name = f"GET {url}"
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.session.get(url, headers=headers, timeout=10)
             
             if response.status_code == expected_status:
                 self.log_result(
@@ -59,11 +109,8 @@ class APITester:
         url = f"{self.base_url}{endpoint}"
         test_name = f"POST {url}"
         
-        if headers is None:
-            headers = {'Content-Type': 'application/json'}
-        
         try:
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            response = self.session.post(url, json=data, headers=headers, timeout=10)
             
             if response.status_code == expected_status:
                 self.log_result(
@@ -89,11 +136,8 @@ class APITester:
         url = f"{self.base_url}{endpoint}"
         test_name = f"PUT {url}"
         
-        if headers is None:
-            headers = {'Content-Type': 'application/json'}
-        
         try:
-            response = requests.put(url, json=data, headers=headers, timeout=10)
+            response = self.session.put(url, json=data, headers=headers, timeout=10)
             
             if response.status_code == expected_status:
                 self.log_result(
@@ -119,11 +163,8 @@ class APITester:
         url = f"{self.base_url}{endpoint}"
         test_name = f"PATCH {url}"
         
-        if headers is None:
-            headers = {'Content-Type': 'application/json'}
-        
         try:
-            response = requests.patch(url, json=data, headers=headers, timeout=10)
+            response = self.session.patch(url, json=data, headers=headers, timeout=10)
             
             if response.status_code == expected_status:
                 self.log_result(
@@ -150,7 +191,7 @@ class APITester:
         test_name = f"DELETE {url}"
         
         try:
-            response = requests.delete(url, headers=headers, timeout=10)
+            response = self.session.delete(url, headers=headers, timeout=10)
             
             if response.status_code == expected_status:
                 self.log_result(
@@ -171,26 +212,21 @@ class APITester:
             self.log_result(test_name, 'FAIL', f"Error: {str(e)}")
             return None
     
-    def validate_response_data(self, response, expected_fields: List[str] = None):
-        """Validate response contains expected fields"""
+    def validate_response_data(self, response, compiled_fields: List[Tuple[str, Tuple[str, ...]]] = None):
+        """Validate response contains expected fields (as pre-split field paths)"""
         try:
             data = response.json()
             
-            if expected_fields:
+            if compiled_fields:
                 missing_fields = []
-                for field in expected_fields:
-                    if '.' in field:
-                        parts = field.split('.')
-                        current = data
-                        for part in parts:
-                            if isinstance(current, dict) and part in current:
-                                current = current[part]
-                            else:
-                                missing_fields.append(field)
-                                break
-                    else:
-                        if field not in data:
+                for field, parts in compiled_fields:
+                    current = data
+                    for part in parts:
+                        if isinstance(current, dict) and part in current:
+                            current = current[part]
+                        else:
                             missing_fields.append(field)
+                            break
                 
                 if missing_fields:
                     return False, f"Missing fields: {', '.join(missing_fields)}"
@@ -215,14 +251,17 @@ class APITester:
         if patch_data is None:
             patch_data = {"description": "Partially updated"}
         
+        # Split nested field paths (e.g. "data.id") once for the whole run
+        compiled_fields = [(f, tuple(f.split('.'))) for f in expected_fields] if expected_fields else None
+        
         resource_id = None
         
         # CREATE (POST)
         post_response = self.test_post(data=create_data)
         
         if post_response:
-            if expected_fields:
-                is_valid, msg = self.validate_response_data(post_response, expected_fields)
+            if compiled_fields:
+                is_valid, msg = self.validate_response_data(post_response, compiled_fields)
             
             try:
                 response_data = post_response.json()
@@ -240,8 +279,8 @@ class APITester:
         if resource_id:
             get_response = self.test_get(endpoint=f"/{resource_id}")
             
-            if get_response and expected_fields:
-                is_valid, msg = self.validate_response_data(get_response, expected_fields)
+            if get_response and compiled_fields:
+                is_valid, msg = self.validate_response_data(get_response, compiled_fields)
         
         # UPDATE (PUT)
         if resource_id:
@@ -262,10 +301,15 @@ class APITester:
             self.test_delete(endpoint=f"/{resource_id}")
             self.test_get(endpoint=f"/{resource_id}", expected_status=404)
         
-        # EDGE CASES
-        self.test_get(endpoint="/nonexistent-id-12345", expected_status=404)
-        self.test_delete(endpoint="/nonexistent-id-12345", expected_status=404)
-        self.test_post(data={}, expected_status=400)
+        # EDGE CASES - independent of each other, so run them concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(self.test_get, endpoint="/nonexistent-id-12345", expected_status=404),
+                executor.submit(self.test_delete, endpoint="/nonexistent-id-12345", expected_status=404),
+                executor.submit(self.test_post, data={}, expected_status=400)
+            ]
+            for future in futures:
+                future.result()
     
     def get_summary(self):
         """Get test summary"""
@@ -281,45 +325,89 @@ class APITester:
         }
 
 
+# PDF styles are built once and shared by every report
+_STYLES = getSampleStyleSheet()
+_NORMAL = _STYLES['Normal']
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1f77b4'),
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=12
+)
+
+_STATUS_MARKUP = {
+    'PASS': f"<font color='{colors.green.hexval()}'>PASS</font>",
+    'FAIL': f"<font color='{colors.red.hexval()}'>FAIL</font>"
+}
+
+# Horizontal cell padding ReportLab tables apply by default (6pt each side)
+_CELL_PADDING = 12
+
+
+def _table_cell(text: str, col_width: float):
+    """Return plain text if it fits on one line, otherwise a wrapping Paragraph"""
+    if stringWidth(text, _NORMAL.fontName, _NORMAL.fontSize) <= col_width - _CELL_PADDING:
+        return text
+    return Paragraph(text, _NORMAL)
+
+
+# Reports up to this many results use a plain Table instead of a LongTable
+_SMALL_REPORT_ROWS = 20
+
+
+def _report_doc(buffer):
+    """Create the page template shared by all PDF reports"""
+    return SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
+                             topMargin=72, bottomMargin=18)
+
+
+@lru_cache(maxsize=8)
+def _empty_pdf_report(api_url: str) -> bytes:
+    """Build the report for a run without results once per endpoint"""
+    buffer = io.BytesIO()
+    _report_doc(buffer).build([
+        Paragraph("API Test Report", _TITLE_STYLE),
+        Spacer(1, 12),
+        Paragraph(f"<b>API Endpoint:</b> {api_url}", _NORMAL),
+        Spacer(1, 20),
+        Paragraph("No tests were run.", _NORMAL)
+    ])
+    return buffer.getvalue()
+
+
 def generate_pdf_report(tester: APITester, api_url: str):
     """Generate PDF report from test results"""
+    if not tester.results:
+        return io.BytesIO(_empty_pdf_report(api_url))
+    
     buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
-                           topMargin=72, bottomMargin=18)
+    doc = _report_doc(buffer)
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12
-    )
     
     # Title
-    story.append(Paragraph("API Test Report", title_style))
+    story.append(Paragraph("API Test Report", _TITLE_STYLE))
     story.append(Spacer(1, 12))
     
     # Test Info
-    story.append(Paragraph(f"<b>API Endpoint:</b> {api_url}", styles['Normal']))
-    story.append(Paragraph(f"<b>Test Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    story.append(Paragraph(f"<b>API Endpoint:</b> {api_url}", _NORMAL))
+    story.append(Paragraph(f"<b>Test Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _NORMAL))
     story.append(Spacer(1, 20))
     
     # Summary
     summary = tester.get_summary()
-    story.append(Paragraph("Test Summary", heading_style))
+    story.append(Paragraph("Test Summary", _HEADING_STYLE))
     
     summary_data = [
         ['Metric', 'Value'],
@@ -345,19 +433,23 @@ def generate_pdf_report(tester: APITester, api_url: str):
     story.append(Spacer(1, 20))
     
     # Test Results
-    story.append(Paragraph("Detailed Test Results", heading_style))
-    
-    results_data = [['Test', 'Status', 'Details']]
-    
-    for result in tester.results:
-        status_color = colors.green if result['status'] == 'PASS' else colors.red
-        results_data.append([
-            Paragraph(result['test'], styles['Normal']),
-            Paragraph(f"<font color='{status_color.hexval()}'>{result['status']}</font>", styles['Normal']),
-            Paragraph(result['details'][:100], styles['Normal'])
-        ])
+    story.append(Paragraph("Detailed Test Results", _HEADING_STYLE))
+    
+    col_widths = [2.5*inch, 1*inch, 3*inch]
+    results_rows = (
+        [
+            _table_cell(result['test'], col_widths[0]),
+            Paragraph(_STATUS_MARKUP[result['status']], _NORMAL),
+            _table_cell(result['details'][:100], col_widths[2])
+        ]
+        for result in tester.results
+    )
     
-    results_table = Table(results_data, colWidths=[2.5*inch, 1*inch, 3*inch])
+    # LongTable splits across pages row by row and repeats the header row;
+    # small reports fit on a page or two and skip its bookkeeping
+    table_cls = Table if len(tester.results) <= _SMALL_REPORT_ROWS else LongTable
+    results_table = table_cls([['Test', 'Status', 'Details'], *results_rows], colWidths=col_widths,
+                              repeatRows=1, splitByRow=True)
     results_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -365,6 +457,8 @@ def generate_pdf_report(tester: APITester, api_url: str):
         ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
         ('FONTSIZE', (0, 0), (-1, 0), 10),
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('FONTNAME', (0, 1), (-1, -1), _NORMAL.fontName),
+        ('FONTSIZE', (0, 1), (-1, -1), _NORMAL.fontSize),
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('GRID', (0, 0), (-1, -1), 1, colors.black),
         ('VALIGN', (0, 0), (-1, -1), 'TOP')
@@ -378,12 +472,10 @@ def generate_pdf_report(tester: APITester, api_url: str):
     return buffer
 
 
-# Streamlit UI
-def main():
-    st.set_page_config(page_title="API CRUD Tester", page_icon="🔧", layout="wide")
-    
-    # Custom CSS
-    st.markdown("""
+@st.cache_resource
+def _css() -> str:
+    """Page stylesheet, built once per server process"""
+    return """
         <style>
         .main-header {
             font-size: 3rem;
@@ -410,7 +502,15 @@ def main():
             margin: 1rem 0;
         }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+# Streamlit UI
+def main():
+    st.set_page_config(page_title="API CRUD Tester", page_icon="🔧", layout="wide")
+    
+    # Custom CSS
+    st.markdown(_css(), unsafe_allow_html=True)
     
     st.markdown('<h1 class="main-header">🔧 API CRUD Tester</h1>', unsafe_allow_html=True)
     st.markdown("---")
@@ -483,9 +583,9 @@ def main():
         
         try:
             # Parse JSON data
-            create_json = json.loads(create_data)
-            update_json = json.loads(update_data)
-            patch_json = json.loads(patch_data)
+            create_json = loads_json(create_data)
+            update_json = loads_json(update_data)
+            patch_json = loads_json(patch_data)
             expected_fields_list = [f.strip() for f in expected_fields.split(",")] if expected_fields else None
             
         except json.JSONDecodeError as e:
@@ -494,13 +594,13 @@ def main():
         
         # Run tests
         with st.spinner("Running tests... ⏳"):
-            tester = APITester(api_url)
-            tester.run_full_crud_test(
-                create_data=create_json,
-                update_data=update_json,
-                patch_data=patch_json,
-                expected_fields=expected_fields_list
-            )
+            with APITester(api_url) as tester:
+                tester.run_full_crud_test(
+                    create_data=create_json,
+                    update_data=update_json,
+                    patch_data=patch_json,
+                    expected_fields=expected_fields_list
+                )
         
         # Display Results
         st.success("✅ Tests completed!")
@@ -519,23 +619,18 @@ def main():
         # Detailed Results
         st.subheader("📋 Detailed Test Results")
         
+        # Render all result boxes in a single markdown element
+        result_boxes = []
         for result in tester.results:
-            if result['status'] == 'PASS':
-                st.markdown(f"""
-                    <div class="success-box">
-                        <strong>✅ {result['test']}</strong><br>
-                        {result['details']}<br>
-                        <small>🕒 {result['timestamp']}</small>
-                    </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                    <div class="fail-box">
-                        <strong>❌ {result['test']}</strong><br>
-                        {result['details']}<br>
-                        <small>🕒 {result['timestamp']}</small>
-                    </div>
-                """, unsafe_allow_html=True)
+            box_class, icon = ('success-box', '✅') if result['status'] == 'PASS' else ('fail-box', '❌')
+            result_boxes.append(
+                f'<div class="{box_class}">'
+                f"<strong>{icon} {result['test']}</strong><br>"
+                f"{result['details']}<br>"
+                f"<small>🕒 {format_timestamp(result['timestamp'])}</small>"
+                '</div>'
+            )
+        st.markdown("\n".join(result_boxes), unsafe_allow_html=True)
         
         st.markdown("---")
         
@@ -550,12 +645,12 @@ def main():
                 'api_url': api_url,
                 'timestamp': datetime.now().isoformat(),
                 'summary': summary,
-                'results': tester.results
+                'results': [{**r, 'timestamp': format_timestamp(r['timestamp'])} for r in tester.results]
             }
             
             st.download_button(
                 label="📄 Download JSON Report",
-                data=json.dumps(json_report, indent=2),
+                data=dumps_json(json_report),
                 file_name=f"api_test_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
@@ -1,27 +1,121 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple, TypedDict
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.pdfbase.pdfmetrics import stringWidth
 import io
+import pandas as pd
+import re
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from dotenv import load_dotenv
 import os
 
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
+
+# orjson only handles 64-bit integers: it refuses to serialize larger ones
+# (TypeError) and parses them as floats, so those values go through json instead
+_LONG_DIGITS = re.compile(r'\d{19}')
+_LONG_DIGITS_BYTES = re.compile(rb'\d{19}')
+
+
+def dumps_json(obj) -> str:
+    """Serialize to indented JSON, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+def compact_json(obj) -> str:
+    """Serialize to single-line JSON with no padding, for embedding in prompts"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def canonical_json(obj) -> str:
+    """Serialize with sorted keys, so equal values always give the same text"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+
+def loads_json(text):
+    """Parse JSON text or bytes, using orjson when available and no integer may exceed 64 bits"""
+    if orjson is not None:
+        long_digits = _LONG_DIGITS_BYTES if isinstance(text, bytes) else _LONG_DIGITS
+        if not long_digits.search(text):
+            return orjson.loads(text)
+    return json.loads(text)
+
+
+class RawBody(str):
+    """Request body text that is not valid JSON, sent verbatim instead of JSON-encoded"""
+
+
+# Supported HTTP methods, mapped to whether the request carries a JSON body
+_METHOD_KWARGS = {'GET': False, 'DELETE': False, 'POST': True, 'PUT': True, 'PATCH': True}
+
+
+# Absorb gateway hiccups on idempotent requests; the final response is still
+# returned (not raised), so tests expecting these statuses keep working
+_TRANSIENT_RETRY = Retry(
+    total=2,
+    backoff_factor=0.1,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(['GET', 'PUT', 'DELETE']),
+    raise_on_status=False
+)
+
+
 class APITester:
+    # Keyword the HTTP client takes a pre-encoded body under
+    _RAW_BODY_KWARG = 'data'
+    
     def __init__(self, base_url: str):
         """Initialize the API Tester with base URL"""
         self.base_url = base_url.rstrip('/')
         self.results = []
+        self._passed = 0
+        self._failed = 0
+        
+        # One pooled session shared by all worker threads, so keep-alive
+        # connections are reused across test cases
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=_TRANSIENT_RETRY)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
     def log_result(self, test_name: str, status: str, details: str):
         """Log test results"""
@@ -32,111 +126,240 @@ class APITester:
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
         self.results.append(result)
+        if status == 'PASS':
+            self._passed += 1
+        else:
+            self._failed += 1
     
     def test_request(self, method: str, endpoint: str = '', data: Dict = None, 
                     expected_status: int = 200, headers: Dict = None, test_name: str = None):
         """Generic test method for any HTTP method"""
-        url = f"{self.base_url}{endpoint}"
-        
         if test_name is None:
-            test_name = f"{method} {url}"
+            test_name = f"{method} {self.base_url}{endpoint}"
+        
+        status, details, response = self._execute(method, endpoint, data, expected_status, headers)
+        self.log_result(test_name, status, details)
+        return response
+    
+    def _prepare(self, method: str, endpoint: str, data: Dict, headers: Dict):
+        """Build the URL and request arguments, or None for an unsupported method"""
+        takes_body = _METHOD_KWARGS.get(method)
+        if takes_body is None:
+            return None
         
         if headers is None:
             headers = {'Content-Type': 'application/json'}
         
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, timeout=10)
-            elif method == "POST":
-                response = requests.post(url, json=data, headers=headers, timeout=10)
-            elif method == "PUT":
-                response = requests.put(url, json=data, headers=headers, timeout=10)
-            elif method == "PATCH":
-                response = requests.patch(url, json=data, headers=headers, timeout=10)
-            elif method == "DELETE":
-                response = requests.delete(url, headers=headers, timeout=10)
+        kwargs = {'headers': headers, 'timeout': 10}
+        if takes_body:
+            if isinstance(data, RawBody):
+                # Malformed-JSON tests must reach the server exactly as written
+                kwargs['headers'] = {'Content-Type': 'application/json', **headers}
+                kwargs[self._RAW_BODY_KWARG] = data.encode()
             else:
-                self.log_result(test_name, 'FAIL', f"Unsupported method: {method}")
-                return None
-            
-            if response.status_code == expected_status:
-                self.log_result(
-                    test_name, 
-                    'PASS', 
-                    f"Status: {response.status_code}, Response time: {response.elapsed.total_seconds():.2f}s"
-                )
-                return response
-            else:
-                self.log_result(
-                    test_name, 
-                    'FAIL', 
-                    f"Expected status {expected_status}, got {response.status_code}. Response: {response.text[:150]}"
-                )
-                return None
-                
+                kwargs['json'] = data
+        return f"{self.base_url}{endpoint}", kwargs
+    
+    def _evaluate(self, response, expected_status: int):
+        """Turn a response into (status, details, response) against the expected status"""
+        if response.status_code == expected_status:
+            return (
+                'PASS', 
+                f"Status: {response.status_code}, Response time: {response.elapsed.total_seconds():.2f}s",
+                response
+            )
+        else:
+            return (
+                'FAIL', 
+                f"Expected status {expected_status}, got {response.status_code}. Response: {response.text[:150]}",
+                None
+            )
+    
+    def _execute(self, method: str, endpoint: str = '', data: Dict = None, 
+                 expected_status: int = 200, headers: Dict = None):
+        """Send one request and return (status, details, response) without logging it"""
+        prepared = self._prepare(method, endpoint, data, headers)
+        if prepared is None:
+            return 'FAIL', f"Unsupported method: {method}", None
+        url, kwargs = prepared
+        
+        try:
+            response = self.session.request(method, url, **kwargs)
+            return self._evaluate(response, expected_status)
         except requests.exceptions.RequestException as e:
-            self.log_result(test_name, 'FAIL', f"Error: {str(e)}")
-            return None
+            return 'FAIL', f"Error: {str(e)}", None
+    
+    @staticmethod
+    def _case_args(test_case: Dict) -> Dict:
+        """Request arguments for one AI-generated test case"""
+        return {
+            'method': test_case.get('method', 'GET'),
+            'endpoint': test_case.get('endpoint', ''),
+            'data': test_case.get('data'),
+            'expected_status': test_case.get('expected_status', 200)
+        }
     
-    def run_ai_generated_tests(self, test_cases: List[Dict]):
-        """Run AI-generated test cases"""
-        for i, test_case in enumerate(test_cases, 1):
-            method = test_case.get('method', 'GET')
-            endpoint = test_case.get('endpoint', '')
-            data = test_case.get('data')
-            expected_status = test_case.get('expected_status', 200)
+    @classmethod
+    def _unique_cases(cls, test_cases: List[Dict]) -> List[Tuple[int, Dict]]:
+        """Drop test cases that would send the same request and expect the same status,
+        keeping each remaining case's 1-based position in the original list"""
+        seen = set()
+        unique = []
+        for i, tc in enumerate(test_cases, 1):
+            args = cls._case_args(tc)
+            key = (args['method'], args['endpoint'], isinstance(args['data'], RawBody),
+                   canonical_json(args['data']), args['expected_status'])
+            if key not in seen:
+                seen.add(key)
+                unique.append((i, tc))
+        return unique
+    
+    def _log_ai_outcomes(self, numbered_cases: List[Tuple[int, Dict]], outcomes):
+        """Log (status, details, response) outcomes in test-case order, numbered as generated"""
+        for (i, test_case), (status, details, _) in zip(numbered_cases, outcomes):
             description = test_case.get('description', f'Test {i}')
-            
-            test_name = f"[AI Test {i}] {description}"
-            
-            self.test_request(
-                method=method,
-                endpoint=endpoint,
-                data=data,
-                expected_status=expected_status,
-                test_name=test_name
-            )
+            self.log_result(f"[AI Test {i}] {description}", status, details)
+    
+    def run_ai_generated_tests(self, test_cases: List[Dict], max_workers: int = 16):
+        """Run AI-generated test cases concurrently, logging results in test order"""
+        numbered_cases = self._unique_cases(test_cases)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes = executor.map(lambda case: self._execute(**self._case_args(case[1])), numbered_cases)
+            self._log_ai_outcomes(numbered_cases, outcomes)
     
     def get_summary(self):
-        """Get test summary"""
-        total = len(self.results)
-        passed = sum(1 for r in self.results if r['status'] == 'PASS')
-        failed = total - passed
+        """Get test summary from the running counters kept by log_result"""
+        passed = self._passed
+        total = passed + self._failed
         
         return {
             'total': total,
             'passed': passed,
-            'failed': failed,
+            'failed': self._failed,
             'pass_rate': (passed/total*100) if total > 0 else 0
         }
 
 
-class GeminiTestGenerator:
-    def __init__(self, api_key: str):
-        """Initialize Gemini AI"""
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-2.5-flash')
+class AsyncAPITester(APITester):
+    """APITester that runs AI-generated suites on one httpx.AsyncClient"""
     
-    def generate_test_cases(self, api_url: str, sample_data: Dict, num_tests: int = 50, 
-                           test_types: List[str] = None) -> List[Dict]:
-        """Generate test cases using Gemini AI"""
+    _RAW_BODY_KWARG = 'content'
+    
+    def __init__(self, base_url: str, max_connections: int = 64):
+        super().__init__(base_url)
+        self.max_connections = max_connections
+    
+    def _async_client(self):
+        """Create the client, multiplexing over HTTP/2 when the h2 package is installed;
+        redirects are followed as the requests-based APITester does"""
+        limits = httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=32)
+        try:
+            return httpx.AsyncClient(http2=True, limits=limits, follow_redirects=True)
+        except ImportError:
+            return httpx.AsyncClient(limits=limits, follow_redirects=True)
+    
+    async def test_request_async(self, client, method: str, endpoint: str = '', data: Dict = None,
+                                 expected_status: int = 200, headers: Dict = None):
+        """Async counterpart of _execute: return (status, details, response) without logging it"""
+        prepared = self._prepare(method, endpoint, data, headers)
+        if prepared is None:
+            return 'FAIL', f"Unsupported method: {method}", None
+        url, kwargs = prepared
         
-        if test_types is None:
-            test_types = ["happy_path", "edge_cases", "negative_tests", "security_tests"]
+        try:
+            response = await client.request(method, url, **kwargs)
+            # httpx has no status-based retries, so apply the session's _TRANSIENT_RETRY policy here
+            for attempt in range(_TRANSIENT_RETRY.total):
+                if (method not in _TRANSIENT_RETRY.allowed_methods
+                        or response.status_code not in _TRANSIENT_RETRY.status_forcelist):
+                    break
+                await asyncio.sleep(_TRANSIENT_RETRY.backoff_factor * 2 ** attempt)
+                response = await client.request(method, url, **kwargs)
+            return self._evaluate(response, expected_status)
+        except (httpx.HTTPError, httpx.InvalidURL) as e:
+            return 'FAIL', f"Error: {str(e)}", None
+    
+    async def run_ai_generated_tests_async(self, test_cases: List[Dict]):
+        """Run all test cases concurrently, logging results in test order"""
+        numbered_cases = self._unique_cases(test_cases)
+        # Keep in-flight requests within the pool so queued ones don't hit pool timeouts
+        slots = asyncio.Semaphore(self.max_connections)
         
-        prompt = f"""
-You are an expert API testing specialist. Generate exactly {num_tests} comprehensive test cases for the following API:
+        async def run_case(client, test_case):
+            async with slots:
+                return await self.test_request_async(client, **self._case_args(test_case))
+        
+        async with self._async_client() as client:
+            outcomes = await asyncio.gather(*(run_case(client, tc) for _, tc in numbered_cases))
+        self._log_ai_outcomes(numbered_cases, outcomes)
+    
+    def run_ai_generated_tests(self, test_cases: List[Dict], max_workers: int = 16):
+        """Run AI-generated test cases through the async client"""
+        asyncio.run(self.run_ai_generated_tests_async(test_cases))
 
-API Endpoint: {api_url}
-Sample Data Structure: {json.dumps(sample_data, indent=2)}
 
-Generate test cases covering these categories:
-{', '.join(test_types)}
+def make_tester(base_url: str) -> APITester:
+    """Use the async tester when httpx is installed, otherwise the threaded one"""
+    if httpx is not None:
+        return AsyncAPITester(base_url)
+    return APITester(base_url)
+
+
+class GeneratedTestCase(TypedDict):
+    """Response schema Gemini fills in for each generated test case"""
+    method: str
+    endpoint: str
+    data: str  # JSON-encoded request body, "null" when there is none
+    expected_status: int
+    description: str
+    category: str
+
+
+# Cleanup patterns for free-form model output
+_FENCE_RE = re.compile(r'```(?:json)?\s*([\s\S]*?)\s*```')
+_PY_LITERAL_RE = re.compile(r"'|True|False|None")
+_PY_LITERAL_FIXES = {"'": '"', 'True': 'true', 'False': 'false', 'None': 'null'}
+
+
+def clean_model_json(response_text: str) -> str:
+    """Strip code fences and surrounding prose, and map Python literals to JSON"""
+    if '```' in response_text:
+        match = _FENCE_RE.search(response_text)
+        if match:
+            response_text = match.group(1)
+        else:
+            response_text = response_text.replace('```json', '').replace('```', '').strip()
+    
+    start_idx = response_text.find('[')
+    end_idx = response_text.rfind(']')
+    
+    if start_idx != -1 and end_idx != -1:
+        response_text = response_text[start_idx:end_idx+1]
+    
+    return _PY_LITERAL_RE.sub(lambda m: _PY_LITERAL_FIXES[m.group()], response_text)
+
+
+def decode_request_body(data):
+    """Decode a JSON-encoded request body; text that is not valid JSON is kept as a RawBody"""
+    if not isinstance(data, str):
+        return data
+    try:
+        return loads_json(data)
+    except json.JSONDecodeError:
+        return RawBody(data)
+
+
+GEMINI_MODEL = 'gemini-2.5-flash'
+
+# Static part of the test-generation prompt, sent as the model's system
+# instruction instead of being rebuilt into every request
+TEST_GENERATION_INSTRUCTIONS = """
+You are an expert API testing specialist. You generate comprehensive test cases for the API described in each request.
 
 For each test case, provide:
 1. method: HTTP method (GET, POST, PUT, PATCH, DELETE)
 2. endpoint: Additional path after base URL (e.g., "", "/123", "/invalid-id")
-3. data: The request body (null for GET/DELETE)
+3. data: The request body encoded as a JSON string ("null" for GET/DELETE)
 4. expected_status: Expected HTTP status code (200, 201, 400, 404, etc.)
 5. description: Clear description of what this test validates (use plain text, no special characters)
 6. category: Type of test (happy_path, edge_case, negative_test, security_test)
@@ -155,93 +378,67 @@ Include diverse test cases:
 - Invalid IDs for GET/PUT/PATCH/DELETE
 - Malformed JSON structures
 
-CRITICAL REQUIREMENTS:
-- Return ONLY valid JSON array
-- NO markdown formatting, NO code blocks, NO explanations
-- Use double quotes for all strings
-- Ensure all JSON is properly escaped
-- Use null (not None) for empty values
-- Descriptions must use plain text only
+Descriptions must use plain text only.
 
-Example format (replace with actual test cases):
-[
-  {{
-    "method": "POST",
-    "endpoint": "",
-    "data": {{"name": "TestValue"}},
-    "expected_status": 201,
-    "description": "Valid POST request with all required fields",
-    "category": "happy_path"
-  }}
-]
+Example test case (replace with actual test cases):
+{
+  "method": "POST",
+  "endpoint": "",
+  "data": "{\\"name\\": \\"TestValue\\"}",
+  "expected_status": 201,
+  "description": "Valid POST request with all required fields",
+  "category": "happy_path"
+}
 """
+
+
+class GeminiTestGenerator:
+    def __init__(self, api_key: str):
+        """Initialize Gemini AI"""
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(GEMINI_MODEL)
+        self.generation_model = genai.GenerativeModel(GEMINI_MODEL, system_instruction=TEST_GENERATION_INSTRUCTIONS)
+    
+    def generate_test_cases(self, api_url: str, sample_data: Dict, num_tests: int = 50, 
+                           test_types: List[str] = None) -> List[Dict]:
+        """Generate test cases using Gemini AI"""
         
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = self.model.generate_content(prompt)
-                response_text = response.text.strip()
-                
-                # Aggressive cleaning of response
-                if '```' in response_text:
-                    import re
-                    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-                    if match:
-                        response_text = match.group(1)
-                    else:
-                        response_text = response_text.replace('```json', '').replace('```', '').strip()
-                
-                # Remove any leading/trailing text before/after JSON array
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']')
-                
-                if start_idx != -1 and end_idx != -1:
-                    response_text = response_text[start_idx:end_idx+1]
-                
-                # Try to parse
-                test_cases = json.loads(response_text)
-                
-                # Validate structure
-                if isinstance(test_cases, list) and len(test_cases) > 0:
-                    valid_cases = []
-                    for tc in test_cases:
-                        if all(key in tc for key in ['method', 'expected_status', 'description']):
-                            tc.setdefault('endpoint', '')
-                            tc.setdefault('data', None)
-                            tc.setdefault('category', 'other')
-                            valid_cases.append(tc)
-                    
-                    if valid_cases:
-                        return valid_cases
-                
-                if attempt < max_retries - 1:
-                    st.warning(f"Attempt {attempt + 1} failed validation. Retrying...")
-                    continue
-                    
-            except json.JSONDecodeError as e:
-                if attempt < max_retries - 1:
-                    st.warning(f"Attempt {attempt + 1}: JSON parsing failed. Retrying...")
-                    response_text = response_text.replace("'", '"')
-                    response_text = response_text.replace('True', 'true').replace('False', 'false')
-                    response_text = response_text.replace('None', 'null')
-                    try:
-                        test_cases = json.loads(response_text)
-                        return test_cases
-                    except:
-                        continue
-                else:
-                    st.error(f"Failed to parse AI response after {max_retries} attempts")
-                    return []
-                    
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    st.warning(f"Attempt {attempt + 1}: Error - {str(e)}. Retrying...")
-                    continue
-                else:
-                    st.error(f"AI generation failed after {max_retries} attempts: {str(e)}")
-                    return []
+        if test_types is None:
+            test_types = ["happy_path", "edge_cases", "negative_tests", "security_tests"]
         
-        return []
+        prompt = f"""
+Generate exactly {num_tests} comprehensive test cases for the following API:
+
+API Endpoint: {api_url}
+Sample Data Structure: {compact_json(sample_data)}
+
+Generate test cases covering these categories:
+{', '.join(test_types)}
+"""
+        
+        try:
+            response = self.generation_model.generate_content(
+                prompt,
+                generation_config={
+                    'response_mime_type': 'application/json',
+                    'response_schema': list[GeneratedTestCase]
+                }
+            )
+            test_cases = loads_json(response.text)
+        except Exception as e:
+            st.error(f"AI generation failed: {str(e)}")
+            return []
+        
+        # Validate structure
+        valid_cases = []
+        for tc in test_cases:
+            if all(key in tc for key in ['method', 'expected_status', 'description']):
+                tc['data'] = decode_request_body(tc.get('data'))
+                tc.setdefault('endpoint', '')
+                tc.setdefault('category', 'other')
+                valid_cases.append(tc)
+        
+        return valid_cases
     
     def analyze_failures_and_generate_more(self, failed_tests: List[Dict], num_additional: int = 20) -> List[Dict]:
         """Analyze failed tests and generate more targeted test cases"""
@@ -250,7 +447,7 @@ Example format (replace with actual test cases):
 Analyze these failed API tests and generate {num_additional} additional targeted test cases:
 
 Failed Tests:
-{json.dumps(failed_tests[:10], indent=2)}
+{compact_json(failed_tests[:10])}
 
 Based on the failure patterns, generate new test cases that explore similar issues.
 
@@ -275,23 +472,11 @@ NO markdown, NO code blocks, ONLY the JSON array.
                 response = self.model.generate_content(prompt)
                 response_text = response.text.strip()
                 
-                if '```' in response_text:
-                    import re
-                    match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', response_text)
-                    if match:
-                        response_text = match.group(1)
-                    else:
-                        response_text = response_text.replace('```json', '').replace('```', '').strip()
-                
-                start_idx = response_text.find('[')
-                end_idx = response_text.rfind(']')
-                
-                if start_idx != -1 and end_idx != -1:
-                    response_text = response_text[start_idx:end_idx+1]
-                
-                response_text = response_text.replace("'", '"').replace('True', 'true').replace('False', 'false').replace('None', 'null')
-                
-                test_cases = json.loads(response_text)
+                # Clean JSON is the common case; only fall back to cleanup when it does not parse
+                try:
+                    test_cases = loads_json(response_text)
+                except json.JSONDecodeError:
+                    test_cases = loads_json(clean_model_json(response_text))
                 
                 if isinstance(test_cases, list) and len(test_cases) > 0:
                     return test_cases
@@ -306,41 +491,110 @@ NO markdown, NO code blocks, ONLY the JSON array.
         return []
 
 
+@st.cache_resource(show_spinner=False)
+def get_generator(api_key: str) -> GeminiTestGenerator:
+    """Configured Gemini generator, shared across reruns for the same API key"""
+    return GeminiTestGenerator(api_key)
+
+
+# PDF styles are built once and shared by every report
+_STYLES = getSampleStyleSheet()
+_NORMAL = _STYLES['Normal']
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#1f77b4'),
+    spaceAfter=30,
+    alignment=TA_CENTER
+)
+
+_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=12
+)
+
+# Passed and failed results get separate tables, so each status column is
+# coloured by one style command instead of inline markup in every cell
+_STATUS_COLORS = {'PASS': colors.green, 'FAIL': colors.red}
+
+# Horizontal cell padding ReportLab tables apply by default (6pt each side)
+_CELL_PADDING = 12
+
+
+def _table_cell(text: str, col_width: float):
+    """Return plain text if it fits on one line, otherwise a wrapping Paragraph"""
+    if stringWidth(text, _NORMAL.fontName, _NORMAL.fontSize) <= col_width - _CELL_PADDING:
+        return text
+    return Paragraph(text, _NORMAL)
+
+
+_RESULTS_COL_WIDTHS = [2.5*inch, 1*inch, 3*inch]
+
+# Results are laid out as consecutive tables of this many rows, so ReportLab
+# never has to re-split one huge table page after page
+_RESULTS_CHUNK_ROWS = 50
+
+
+def _results_table(rows: List[list], with_header: bool, status_color):
+    """Build one chunk of the detailed results table"""
+    commands = [
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP')
+    ]
+    first_body_row = 0
+    
+    if with_header:
+        rows = [['Test', 'Status', 'Details'], *rows]
+        commands += [
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12)
+        ]
+        first_body_row = 1
+    
+    commands += [
+        ('FONTNAME', (0, first_body_row), (-1, -1), _NORMAL.fontName),
+        ('FONTSIZE', (0, first_body_row), (-1, -1), _NORMAL.fontSize),
+        ('BACKGROUND', (0, first_body_row), (-1, -1), colors.beige),
+        ('TEXTCOLOR', (1, first_body_row), (1, -1), status_color)
+    ]
+    
+    table = Table(rows, colWidths=_RESULTS_COL_WIDTHS)
+    table.setStyle(TableStyle(commands))
+    return table
+
+
 def generate_pdf_report(tester: APITester, api_url: str):
-    """Generate PDF report from test results"""
+    """Generate PDF report from test results, reusing the last build while they are unchanged"""
+    results = tuple((r['test'], r['status'], r['details'], r['timestamp']) for r in tester.results)
+    return io.BytesIO(generate_pdf_report_cached(results, tester.get_summary(), api_url))
+
+
+@st.cache_data(show_spinner=False)
+def generate_pdf_report_cached(results: tuple, summary: dict, api_url: str) -> bytes:
+    """Build the PDF report from (test, status, details, timestamp) tuples"""
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72,
                            topMargin=72, bottomMargin=18)
     
     story = []
-    styles = getSampleStyleSheet()
-    
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#1f77b4'),
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=12
-    )
-    
-    story.append(Paragraph("API Test Report (AI-Generated)", title_style))
+    
+    story.append(Paragraph("API Test Report (AI-Generated)", _TITLE_STYLE))
     story.append(Spacer(1, 12))
     
-    story.append(Paragraph(f"<b>API Endpoint:</b> {api_url}", styles['Normal']))
-    story.append(Paragraph(f"<b>Test Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
+    story.append(Paragraph(f"<b>API Endpoint:</b> {api_url}", _NORMAL))
+    story.append(Paragraph(f"<b>Test Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _NORMAL))
     story.append(Spacer(1, 20))
     
-    summary = tester.get_summary()
-    story.append(Paragraph("Test Summary", heading_style))
+    story.append(Paragraph("Test Summary", _HEADING_STYLE))
     
     summary_data = [
         ['Metric', 'Value'],
@@ -365,51 +619,51 @@ def generate_pdf_report(tester: APITester, api_url: str):
     story.append(summary_table)
     story.append(Spacer(1, 20))
     
-    story.append(Paragraph("Detailed Test Results", heading_style))
-    
-    results_data = [['Test', 'Status', 'Details']]
+    story.append(Paragraph("Detailed Test Results", _HEADING_STYLE))
     
-    for result in tester.results:
-        status_color = colors.green if result['status'] == 'PASS' else colors.red
-        results_data.append([
-            Paragraph(result['test'][:60], styles['Normal']),
-            Paragraph(f"<font color='{status_color.hexval()}'>{result['status']}</font>", styles['Normal']),
-            Paragraph(result['details'][:80], styles['Normal'])
+    rows_by_status = {status: [] for status in _STATUS_COLORS}
+    for test, status, details, _ in results:
+        rows_by_status[status].append([
+            _table_cell(test[:60], _RESULTS_COL_WIDTHS[0]),
+            status,
+            _table_cell(details[:80], _RESULTS_COL_WIDTHS[2])
         ])
     
-    results_table = Table(results_data, colWidths=[2.5*inch, 1*inch, 3*inch])
-    results_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP')
-    ]))
-    
-    story.append(results_table)
+    for status, status_rows in rows_by_status.items():
+        if not status_rows:
+            continue
+        
+        # Chunks are stacked without spacing so they read as a single table
+        for start in range(0, len(status_rows), _RESULTS_CHUNK_ROWS):
+            chunk = status_rows[start:start + _RESULTS_CHUNK_ROWS]
+            story.append(_results_table(chunk, with_header=(start == 0), status_color=_STATUS_COLORS[status]))
+        story.append(Spacer(1, 12))
     
     doc.build(story)
-    buffer.seek(0)
-    return buffer
+    return buffer.getvalue()
 
 
-def main():
-    st.set_page_config(page_title="AI API Tester", page_icon="🤖", layout="wide")
-    
-    # Load Gemini API key from environment
-    gemini_api_key = os.getenv('GEMINI_API_KEY')
-    
-    # Check if API key is configured
-    if not gemini_api_key:
-        st.error("⚠️ GEMINI_API_KEY not found in .env file. Please configure it to use this application.")
-        st.info("Create a .env file in the project root with: GEMINI_API_KEY=your_api_key_here")
-        st.stop()
-    
-    st.markdown("""
+_RESULT_COLUMNS = {'test': 'Test', 'status': 'Status', 'details': 'Details', 'timestamp': 'Timestamp'}
+
+_STATUS_FILTERS = {"Passed Only": 'PASS', "Failed Only": 'FAIL'}
+
+_ROW_STYLES = {'PASS': 'background-color: #d4edda', 'FAIL': 'background-color: #f8d7da'}
+
+
+def results_frame(tester: APITester) -> pd.DataFrame:
+    """Test results as a DataFrame for the results tab"""
+    return pd.DataFrame(tester.results, columns=list(_RESULT_COLUMNS)).rename(columns=_RESULT_COLUMNS)
+
+
+def _highlight_status(row: pd.Series) -> List[str]:
+    """Colour a whole results row by its status"""
+    return [_ROW_STYLES[row['Status']]] * len(row)
+
+
+@st.cache_resource
+def _css() -> str:
+    """Page stylesheet, built once per server process"""
+    return """
         <style>
         .main-header {
             font-size: 3rem;
@@ -431,18 +685,6 @@ def main():
             padding: 0.75rem 1.5rem;
             font-size: 1.1rem;
         }
-        .success-box {
-            padding: 1rem;
-            background-color: #d4edda;
-            border-left: 5px solid #28a745;
-            margin: 1rem 0;
-        }
-        .fail-box {
-            padding: 1rem;
-            background-color: #f8d7da;
-            border-left: 5px solid #dc3545;
-            margin: 1rem 0;
-        }
         .info-box {
             padding: 1rem;
             background-color: #d1ecf1;
@@ -455,7 +697,33 @@ def main():
             padding: 2rem;
         }
         </style>
-    """, unsafe_allow_html=True)
+    """
+
+
+@st.cache_resource
+def _footer() -> str:
+    """Page footer, built once per server process"""
+    return """
+        <div style='text-align: center; color: gray;'>
+            <p>🤖 Powered by Google Gemini AI | Built with Streamlit ❤️</p>
+            <p><small>AI generates intelligent test cases covering happy paths, edge cases, negative scenarios, and security tests</small></p>
+        </div>
+    """
+
+
+def main():
+    st.set_page_config(page_title="AI API Tester", page_icon="🤖", layout="wide")
+    
+    # Load Gemini API key from environment
+    gemini_api_key = os.getenv('GEMINI_API_KEY')
+    
+    # Check if API key is configured
+    if not gemini_api_key:
+        st.error("⚠️ GEMINI_API_KEY not found in .env file. Please configure it to use this application.")
+        st.info("Create a .env file in the project root with: GEMINI_API_KEY=your_api_key_here")
+        st.stop()
+    
+    st.markdown(_css(), unsafe_allow_html=True)
     
     st.markdown('<h1 class="main-header">🤖 AI-Powered API Tester</h1>', unsafe_allow_html=True)
     st.markdown('<p class="subtitle">Intelligent API Testing with Google Gemini AI</p>', unsafe_allow_html=True)
@@ -518,7 +786,7 @@ def main():
                 st.error("❌ Please enter an API URL")
             else:
                 try:
-                    sample_json = json.loads(sample_data)
+                    sample_json = loads_json(sample_data)
                     
                     test_types = []
                     if test_happy: test_types.append("happy_path")
@@ -527,7 +795,7 @@ def main():
                     if test_security: test_types.append("security_tests")
                     
                     with st.spinner("🤖 AI is generating intelligent test cases..."):
-                        generator = GeminiTestGenerator(gemini_api_key)
+                        generator = get_generator(gemini_api_key)
                         test_cases = generator.generate_test_cases(
                             api_url=api_url,
                             sample_data=sample_json,
@@ -575,7 +843,7 @@ def main():
             
             if st.button("▶️ Run All Test Cases", type="primary"):
                 with st.spinner("Running tests... ⏳"):
-                    tester = APITester(st.session_state.api_url)
+                    tester = make_tester(st.session_state.api_url)
                     tester.run_ai_generated_tests(st.session_state.test_cases)
                     st.session_state.test_results = tester
                 
@@ -606,29 +874,16 @@ def main():
             # Display Results
             st.markdown("### 📋 Detailed Test Results")
             
-            filtered_results = tester.results
-            if filter_option == "Passed Only":
-                filtered_results = [r for r in tester.results if r['status'] == 'PASS']
-            elif filter_option == "Failed Only":
-                filtered_results = [r for r in tester.results if r['status'] == 'FAIL']
+            results_df = results_frame(tester)
+            status = _STATUS_FILTERS.get(filter_option)
+            if status is not None:
+                results_df = results_df[results_df['Status'] == status]
             
-            for result in filtered_results:
-                if result['status'] == 'PASS':
-                    st.markdown(f"""
-                        <div class="success-box">
-                            <strong>✅ {result['test']}</strong><br>
-                            {result['details']}<br>
-                            <small>🕒 {result['timestamp']}</small>
-                        </div>
-                    """, unsafe_allow_html=True)
-                else:
-                    st.markdown(f"""
-                        <div class="fail-box">
-                            <strong>❌ {result['test']}</strong><br>
-                            {result['details']}<br>
-                            <small>🕒 {result['timestamp']}</small>
-                        </div>
-                    """, unsafe_allow_html=True)
+            st.dataframe(
+                results_df.style.apply(_highlight_status, axis=1),
+                width='stretch',
+                hide_index=True
+            )
             
             # AI Analysis of Failures
             if summary['failed'] > 0:
@@ -639,7 +894,7 @@ def main():
                     failed_tests = [r for r in tester.results if r['status'] == 'FAIL']
                     
                     with st.spinner("🤖 AI is analyzing failures and generating targeted tests..."):
-                        generator = GeminiTestGenerator(gemini_api_key)
+                        generator = get_generator(gemini_api_key)
                         additional_tests = generator.analyze_failures_and_generate_more(failed_tests, num_additional=20)
                     
                     if additional_tests:
@@ -685,14 +940,15 @@ def main():
                 
                 st.download_button(
                     label="📄 Download JSON Report",
-                    data=json.dumps(json_report, indent=2),
+                    data=dumps_json(json_report),
                     file_name=f"ai_api_test_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                     mime="application/json"
                 )
             
             with col2:
                 st.markdown("### 📕 PDF Report")
-                pdf_buffer = generate_pdf_report(tester, st.session_state.api_url)
+                with st.spinner("Rendering PDF..."):
+                    pdf_buffer = generate_pdf_report(tester, st.session_state.api_url)
                 
                 st.download_button(
                     label="📕 Download PDF Report",
@@ -703,12 +959,7 @@ def main():
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-        <div style='text-align: center; color: gray;'>
-            <p>🤖 Powered by Google Gemini AI | Built with Streamlit ❤️</p>
-            <p><small>AI generates intelligent test cases covering happy paths, edge cases, negative scenarios, and security tests</small></p>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_footer(), unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,305 @@
+"""Shared APITester used by the manual API test scripts"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
+from typing import Dict
+import sys
+import os
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Transport errors from whichever HTTP client the tester ends up using
+# (httpx.InvalidURL is not an httpx.HTTPError)
+REQUEST_ERRORS = (requests.exceptions.RequestException,) + (
+    (httpx.HTTPError, httpx.InvalidURL) if httpx is not None else ()
+)
+
+# Gateway errors retried for idempotent methods, matching the requests adapter's Retry
+RETRY_STATUSES = (502, 503, 504)
+RETRY_METHODS = frozenset({'GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'})
+STATUS_RETRIES = 2
+RETRY_BACKOFF = 0.1
+
+class _Lazy:
+    """Details text that is only formatted when it is printed or saved"""
+    __slots__ = ('_fn', '_args', '_text')
+    
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+        self._text = None
+    
+    def __str__(self):
+        if self._text is None:
+            self._text = self._fn(*self._args)
+        return self._text
+
+def _pass_details(status_code: int, elapsed) -> str:
+    return f"Status: {status_code}, Response time: {elapsed.total_seconds():.2f}s"
+
+class APITester:
+    # Timestamp string of the last logged second, shared by all results in that second
+    _last_ts_sec = 0
+    _last_ts_str = ''
+    
+    # Status prefixes for console output, with and without ANSI colors
+    _COLOR = {'PASS': '\033[92m[PASS]\033[0m ', 'FAIL': '\033[91m[FAIL]\033[0m ', 'SKIPPED': '\033[93m[SKIPPED]\033[0m '}
+    _PLAIN = {'PASS': '[PASS] ', 'FAIL': '[FAIL] ', 'SKIPPED': '[SKIPPED] '}
+    
+    def __init__(self, base_url: str):
+        """Initialize the API Tester with base URL"""
+        self.base_url = base_url.rstrip('/')
+        self.results = []
+        
+        # Running tallies kept by log_result, so summaries never rescan results
+        self._passed = 0
+        self._failed = 0
+        self._skipped = 0
+        self._failed_tests = []
+        
+        # Quiet runs record results without printing each line; request
+        # results then keep (method, url) and build their names and PASS details on demand
+        self.quiet = bool(os.environ.get('API_TEST_QUIET'))
+        
+        # Only color output going to a terminal, not redirected logs
+        self._use_color = sys.stdout.isatty()
+        self._prefix = self._COLOR if self._use_color else self._PLAIN
+        
+        # Console lines are collected here and written out a section at a time
+        self._out_buf = []
+        
+        # Time source for result timestamps; replaceable for deterministic replays
+        self._clock = time.time
+        
+        # ETag and last 2xx response per GET URL, so unchanged resources come back as 304s
+        self._etag_cache = {}
+        self._body_cache = {}
+        
+        # Prefer one pooled httpx client (HTTP/2 when available) for every request
+        if httpx is not None:
+            self.session = self._http_client()
+            self._raw_key = 'content'
+            self._retry_gateway_errors = True
+        else:
+            # Otherwise reuse keep-alive connections across tests; retry idempotent requests
+            # on gateway errors, but still return the last response when they persist
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=32,
+                max_retries=Retry(total=STATUS_RETRIES, backoff_factor=RETRY_BACKOFF,
+                              status_forcelist=list(RETRY_STATUSES), raise_on_status=False)
+            )
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
+            self._raw_key = 'data'
+            self._retry_gateway_errors = False
+    
+    @staticmethod
+    def _http_client():
+        """Create the httpx client, multiplexing over HTTP/2 when the h2 package is installed"""
+        limits = httpx.Limits(max_keepalive_connections=10)
+        try:
+            transport = httpx.HTTPTransport(http2=True, limits=limits, retries=2)
+        except ImportError:
+            transport = httpx.HTTPTransport(limits=limits, retries=2)
+        # Follow redirects like requests does, e.g. Flask's /items -> /items/
+        return httpx.Client(transport=transport, timeout=10, follow_redirects=True)
+    
+    def close(self):
+        """Write out any buffered output and close the pooled connections"""
+        self._flush()
+        self.session.close()
+        
+    def _write(self, text: str = ''):
+        """Buffer one line of output; interactive terminals still see it immediately"""
+        self._out_buf.append(text + '\n')
+        if self._use_color:
+            self._flush()
+    
+    def _section(self, title: str):
+        """Start a new output section, writing out what the previous one buffered"""
+        self._flush()
+        self._write(title)
+    
+    def _flush(self):
+        """Write all buffered output in one call"""
+        sys.stdout.writelines(self._out_buf)
+        self._out_buf.clear()
+    
+    def _record(self, result: Dict):
+        """Timestamp a result, store it and update the running tallies"""
+        now = int(self._clock())
+        if now != APITester._last_ts_sec:
+            APITester._last_ts_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+            APITester._last_ts_sec = now
+        
+        result['timestamp'] = APITester._last_ts_str
+        self.results.append(result)
+        if result['status'] == 'PASS':
+            self._passed += 1
+        elif result['status'] == 'SKIPPED':
+            self._skipped += 1
+        else:
+            self._failed += 1
+            self._failed_tests.append(result)
+    
+    def log_result(self, test_name: str, status: str, details: str):
+        """Log test results"""
+        self._record({'test': test_name, 'status': status, 'details': details})
+        
+        if not self.quiet:
+            self._write(self._prefix[status] + test_name + ': ' + str(details))
+    
+    def _log_request(self, method: str, url: str, status: str, details: str):
+        """Log a request's result, building its name only when it is printed"""
+        if self.quiet:
+            self._record({'request': (method, url), 'status': status, 'details': details})
+        else:
+            self.log_result(f"{method} {url}", status, details)
+    
+    @staticmethod
+    def test_name(result: Dict) -> str:
+        """Name of a logged test, rebuilt from (method, url) for quiet-mode results"""
+        return result['test'] if 'test' in result else '%s %s' % result['request']
+    
+    def _check_status(self, method: str, url: str, response, expected_status: int, sends_body: bool):
+        """Log PASS/FAIL for a response against the expected status; return it only on PASS"""
+        if response.status_code == expected_status:
+            if self.quiet:
+                # Nothing prints this line, so format it only if the report is saved
+                details = _Lazy(_pass_details, response.status_code, response.elapsed)
+            else:
+                details = _pass_details(response.status_code, response.elapsed)
+            self._log_request(method, url, 'PASS', details)
+            return response
+        
+        details = f"Expected status {expected_status}, got {response.status_code}"
+        if sends_body:
+            details += f". Response: {response.text[:200]}"
+        self._log_request(method, url, 'FAIL', details)
+        return None
+    
+    def _etag_headers(self, url: str, headers: Dict):
+        """Add If-None-Match for a URL whose last 2xx response carried an ETag"""
+        etag = self._etag_cache.get(url)
+        if etag is None:
+            return headers
+        return {**(headers or {}), 'If-None-Match': etag}
+    
+    def _check_get(self, url: str, response, expected_status: int):
+        """_check_status for a GET: answer 304s from the cached body, and cache new ETags"""
+        if response.status_code == 304 and url in self._body_cache:
+            cached = self._body_cache[url]
+            if cached.status_code == expected_status:
+                self._log_request('GET', url, 'PASS', "Status: 304 (cached)")
+                return cached
+        
+        result = self._check_status('GET', url, response, expected_status, False)
+        if 200 <= response.status_code < 300:
+            etag = response.headers.get('ETag')
+            if etag:
+                self._etag_cache[url] = etag
+                self._body_cache[url] = response
+        return result
+    
+    @staticmethod
+    def encode_body(data) -> bytes:
+        """Serialize a request body once so it can be sent as-is"""
+        if orjson is not None:
+            try:
+                return orjson.dumps(data)
+            except TypeError:
+                # orjson rejects integers beyond 64 bits; json encodes them exactly
+                pass
+        return json.dumps(data).encode()
+    
+    @staticmethod
+    def _body_args(data, headers: Dict, sends_body: bool, raw_body: bytes, raw_key: str = 'data'):
+        """Headers and body keyword for a request; raw_body is sent under raw_key as-is"""
+        if raw_body is not None:
+            # Already-encoded JSON skips the HTTP client's own serialization
+            return {'Content-Type': 'application/json', **(headers or {})}, {raw_key: raw_body}
+        if sends_body and headers is None:
+            headers = {'Content-Type': 'application/json'}
+        return headers, {'json': data}
+    
+    def _do_request(self, method: str, endpoint: str = '', expected_status: int = 200,
+                    data: Dict = None, headers: Dict = None, sends_body: bool = False,
+                    raw_body: bytes = None):
+        """Send one request through the session and log the outcome"""
+        url = f"{self.base_url}{endpoint}"
+        headers, body = self._body_args(data, headers, sends_body, raw_body, self._raw_key)
+        if method == 'GET':
+            headers = self._etag_headers(url, headers)
+        
+        try:
+            response = self.session.request(method, url, headers=headers, timeout=10, **body)
+            if self._retry_gateway_errors and method in RETRY_METHODS:
+                # The httpx transport only retries failed connections, so retry gateway errors here
+                for attempt in range(STATUS_RETRIES):
+                    if response.status_code not in RETRY_STATUSES:
+                        break
+                    time.sleep(RETRY_BACKOFF * 2 ** attempt)
+                    response = self.session.request(method, url, headers=headers, timeout=10, **body)
+            if method == 'GET':
+                return self._check_get(url, response, expected_status)
+            return self._check_status(method, url, response, expected_status, sends_body)
+        except REQUEST_ERRORS as e:
+            self._log_request(method, url, 'FAIL', f"Error: {str(e)}")
+            return None
+    
+    def test_get(self, endpoint: str = '', expected_status: int = 200, headers: Dict = None):
+        """Test GET operation (READ)"""
+        return self._do_request('GET', endpoint, expected_status, headers=headers)
+    
+    def test_post(self, endpoint: str = '', data: Dict = None, expected_status: int = 201, headers: Dict = None,
+                  raw_body: bytes = None):
+        """Test POST operation (CREATE)"""
+        return self._do_request('POST', endpoint, expected_status, data, headers, sends_body=True, raw_body=raw_body)
+    
+    def test_delete(self, endpoint: str = '', expected_status: int = 200, headers: Dict = None):
+        """Test DELETE operation"""
+        return self._do_request('DELETE', endpoint, expected_status, headers=headers)
+    
+    @staticmethod
+    def _json(response):
+        """Parse a response body once (with orjson when available), caching it on the response"""
+        try:
+            return response._cached_json
+        except AttributeError:
+            response._cached_json = orjson.loads(response.content) if orjson is not None else response.json()
+            return response._cached_json
+    
+    def print_summary(self):
+        """Print test summary"""
+        self._write("\n" + "="*70)
+        self._write("Test Summary")
+        self._write("="*70)
+        
+        passed = self._passed
+        failed = self._failed
+        total = passed + failed
+        
+        self._write(f"\nTotal Tests: {total}")
+        self._write(f"✓ Passed: {passed}")
+        self._write(f"✗ Failed: {failed}")
+        self._write(f"Success Rate: {(passed/total*100):.1f}%\n")
+        
+        if failed > 0:
+            self._write("Failed Tests:")
+            for result in self._failed_tests:
+                self._write(f"  - {self.test_name(result)}: {result['details']}")
+        
+        self._write("="*70 + "\n")
+        self._flush()